@@ -1,13 +1,99 @@
-import pygame
+import time
+STARTUP_T0 = time.perf_counter()
+
+import argparse
+import importlib.util
+import functools
+import io
+import json
+import os
+import queue
+import threading
 import math
 import numpy as np
 
+# Command line options
+parser = argparse.ArgumentParser(description="3D Arbitrary Axis Rotation - Educational Visualizer")
+parser.add_argument("--record", metavar="FILE", help="record per-frame input to FILE")
+parser.add_argument("--replay", metavar="FILE", help="replay input recorded with --record")
+parser.add_argument("--headless", action="store_true", help="render without opening a window")
+parser.add_argument("--timing", metavar="FILE", help="write per-frame timing report (JSON) to FILE")
+parser.add_argument("--backend", choices=("surface", "sdl2"), default="surface",
+                    help="compositing backend: software Surface blits or SDL2 Renderer/Texture")
+parser.add_argument("--compute", choices=("python", "numpy", "numba"), default="numpy",
+                    help="backend for scene projection and step transforms")
+parser.add_argument("--float32", action="store_true",
+                    help="run projection and transform kernels in float32 instead of float64")
+parser.add_argument("--check-backends", action="store_true",
+                    help="check that all compute backends agree, then exit")
+parser.add_argument("--serve", metavar="PORT", type=int,
+                    help="stream frames as MJPEG on http://127.0.0.1:PORT/ and accept input from the page")
+parser.add_argument("--cache-dir", metavar="DIR",
+                    help="where --compute numba caches its compiled kernels between runs "
+                         "(default: $NUMBA_CACHE_DIR, else ~/.cache/rotation3d); nothing else "
+                         "is cached on disk, so other backends get no speedup on relaunch")
+parser.add_argument("--no-cache", action="store_true", help="do not read or write the numba kernel cache")
+parser.add_argument("--startup-report", action="store_true",
+                    help="print how long each startup phase took once the first frame is shown")
+args = parser.parse_args()
+
+# Startup phases: (name, seconds spent since the previous mark)
+startup_phases = []
+startup_last = STARTUP_T0
+
+def mark_startup(phase):
+    """Close the current startup phase"""
+    global startup_last
+    now = time.perf_counter()
+    startup_phases.append((phase, now - startup_last))
+    startup_last = now
+
+# The backend check is pure math; it should not need a display either
+if args.headless or args.check_backends:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+# Compiled numba kernels are reused across runs; an explicit --cache-dir
+# wins over NUMBA_CACHE_DIR from the environment
+numba_kernel_cache = args.compute == "numba" and not args.no_cache
+if numba_kernel_cache:
+    if args.cache_dir is not None:
+        os.environ["NUMBA_CACHE_DIR"] = os.path.join(args.cache_dir, "numba")
+    else:
+        os.environ.setdefault("NUMBA_CACHE_DIR",
+                              os.path.join(os.path.expanduser("~"), ".cache", "rotation3d", "numba"))
+
+import pygame
+mark_startup("import")
+
 # Initialize Pygame
 pygame.init()
 WIDTH, HEIGHT = 1400, 900
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("3D Arbitrary Axis Rotation - Educational Visualizer")
+if args.backend == "sdl2":
+    # Scene lines are still drawn with pygame.draw onto a transparent layer;
+    # planes and HUD become textures composed by the renderer.
+    from pygame._sdl2.video import Window, Renderer, Texture
+    window = Window("3D Arbitrary Axis Rotation - Educational Visualizer", (WIDTH, HEIGHT))
+    renderer = Renderer(window)
+    screen = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+else:
+    renderer = None
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("3D Arbitrary Axis Rotation - Educational Visualizer")
 clock = pygame.time.Clock()
+mark_startup("sdl_init")
+
+# Fonts are loaded once per size instead of on every draw call
+fonts = {}
+
+def get_font(size):
+    font = fonts.get(size)
+    if font is None:
+        font = fonts[size] = pygame.font.Font(None, size)
+    return font
+
+for size in (24, 28, 32, 36):
+    get_font(size)
+mark_startup("fonts")
 
 # Colors
 WHITE = (255, 255, 255)
@@ -53,6 +139,7 @@ theta = PI  # Current rotation angle
 paused = True
 show_angles = True
 show_vector = True #toggle for showing positional vectors
+show_trail = True
 
 def set_view_mode(mode):
     """Set camera to specific view mode"""
@@ -105,30 +192,266 @@ def project_3d(point):
     
     This simulates perspective: objects farther away appear smaller
     
+    The math runs on the selected compute backend (--compute);
+    PythonBackend.project is the plain step-by-step version.
+    
     Returns: (screen_x, screen_y, depth)
     """
-    # First apply camera rotation
-    x, y, z = rotate_point(point, rotation_x, rotation_y)
-    
-    # Move scene away from camera
-    z = z + camera_distance
-    
-    # Prevent division by zero
-    if z <= 0.1:
-        z = 0.1
-    
-    # Perspective projection
-    factor = scale / z
-    screen_x = int(WIDTH / 2 + x * factor)
-    screen_y = int(HEIGHT / 2 - y * factor)  # Negative because screen Y goes down
-    
-    return (screen_x, screen_y, z)
+    x, y, z = project_points(point)[0]
+    return (int(x), int(y), float(z))
+
+def project_points(points):
+    """
+    Batched version of project_3d for an (N, 3) array of points
+
+    Runs on the selected compute backend (--compute / --float32).
+
+    Returns: (N, 3) array of (screen_x, screen_y, depth)
+    """
+    return compute.project(points, rotation_x, rotation_y, scale, camera_distance)
+
+def transform_points(points, matrix):
+    """Apply a 4x4 transformation matrix to an (N, 3) array of points"""
+    return compute.transform(points, matrix)
+
+def current_camera():
+    """Everything the projection depends on besides the points"""
+    return (rotation_x, rotation_y, scale)
+
+def unproject_point(screen_x, screen_y, depth):
+    """
+    Inverse of project_3d for a known depth
+
+    Returns the 3D world point that projects onto (screen_x, screen_y)
+    at the given camera depth.
+    """
+    factor = scale / depth
+    x = (screen_x - WIDTH / 2) / factor
+    y = (HEIGHT / 2 - screen_y) / factor
+    z = depth - camera_distance
+
+    # Undo pitch, then yaw (reverse of rotate_point)
+    angle_x = math.radians(rotation_x)
+    angle_y = math.radians(rotation_y)
+
+    cos_x = math.cos(angle_x)
+    sin_x = math.sin(angle_x)
+    y, z = y * cos_x + z * sin_x, -y * sin_x + z * cos_x
+
+    cos_y = math.cos(angle_y)
+    sin_y = math.sin(angle_y)
+    x, z = x * cos_y - z * sin_y, x * sin_y + z * cos_y
+
+    return (x, y, z)
+
+# ========================================
+# COMPUTE BACKENDS
+# ========================================
+# Batched projection and transform kernels. All backends implement the
+# same math as project_3d / apply_transformation:
+#   python - plain loops with the math module (reference)
+#   numpy  - vectorized NumPy
+#   numba  - JIT-compiled loops, only if numba is installed
+
+class PythonBackend:
+    """Reference kernels, one point at a time"""
+    name = "python"
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+
+    def project(self, points, rot_x, rot_y, zoom, distance):
+        result = []
+        for point in np.asarray(points, dtype=float).reshape(-1, 3).tolist():
+            x, y, z = rotate_point(point, rot_x, rot_y)
+            z = max(z + distance, 0.1)
+            factor = zoom / z
+            result.append((math.trunc(WIDTH / 2 + x * factor),
+                           math.trunc(HEIGHT / 2 - y * factor), z))
+        return np.array(result, dtype=self.dtype).reshape(-1, 3)
+
+    def transform(self, points, matrix):
+        m = np.asarray(matrix, dtype=float).tolist()
+        result = []
+        for x, y, z in np.asarray(points, dtype=float).reshape(-1, 3).tolist():
+            result.append([m[r][0] * x + m[r][1] * y + m[r][2] * z + m[r][3] for r in range(3)])
+        return np.array(result, dtype=self.dtype).reshape(-1, 3)
+
+class NumpyBackend:
+    """Vectorized kernels; float32 halves the memory traffic for big point sets"""
+    name = "numpy"
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+
+    def camera(self, rot_x, rot_y):
+        angle_x = math.radians(rot_x)
+        angle_y = math.radians(rot_y)
+        return math.cos(angle_x), math.sin(angle_x), math.cos(angle_y), math.sin(angle_y)
+
+    def project(self, points, rot_x, rot_y, zoom, distance):
+        pts = np.asarray(points, dtype=self.dtype).reshape(-1, 3)
+        x, y, z = pts[:, 0], pts[:, 1], pts[:, 2]
+        cos_x, sin_x, cos_y, sin_y = (self.dtype.type(v) for v in self.camera(rot_x, rot_y))
+
+        # Same rotation order as rotate_point: yaw, then pitch
+        x, z = x * cos_y + z * sin_y, -x * sin_y + z * cos_y
+        y, z = y * cos_x - z * sin_x, y * sin_x + z * cos_x
+
+        z = np.maximum(z + self.dtype.type(distance), self.dtype.type(0.1))
+        factor = self.dtype.type(zoom) / z
+
+        result = np.empty((len(pts), 3), dtype=self.dtype)
+        result[:, 0] = np.trunc(WIDTH / 2 + x * factor)
+        result[:, 1] = np.trunc(HEIGHT / 2 - y * factor)
+        result[:, 2] = z
+        return result
+
+    def transform(self, points, matrix):
+        pts = np.asarray(points, dtype=self.dtype).reshape(-1, 3)
+        m = np.asarray(matrix, dtype=self.dtype)
+        return pts @ m[:3, :3].T + m[:3, 3]
+
+class NumbaBackend(NumpyBackend):
+    """NumPy backend with the kernels compiled by numba"""
+    name = "numba"
+
+    kernels = None
+
+    def __init__(self, dtype=np.float64):
+        """Raises ImportError if numba is installed but cannot be imported"""
+        super().__init__(dtype)
+        if NumbaBackend.kernels is None:
+            NumbaBackend.kernels = self.compile_kernels()
+        # Compile for this dtype now instead of during the first frame
+        self.project(np.zeros((1, 3)), 0, 0, 1, 1)
+        self.transform(np.zeros((1, 3)), np.eye(4))
+
+    @staticmethod
+    def compile_kernels():
+        import numba
+
+        @numba.njit(cache=numba_kernel_cache)
+        def project(pts, cos_x, sin_x, cos_y, sin_y, zoom, distance, min_depth, half_w, half_h, out):
+            for i in range(pts.shape[0]):
+                x, y, z = pts[i, 0], pts[i, 1], pts[i, 2]
+                x, z = x * cos_y + z * sin_y, -x * sin_y + z * cos_y
+                y, z = y * cos_x - z * sin_x, y * sin_x + z * cos_x
+                z = max(z + distance, min_depth)
+                factor = zoom / z
+                out[i, 0] = np.trunc(half_w + x * factor)
+                out[i, 1] = np.trunc(half_h - y * factor)
+                out[i, 2] = z
+
+        @numba.njit(cache=numba_kernel_cache)
+        def transform(pts, m, out):
+            for i in range(pts.shape[0]):
+                x, y, z = pts[i, 0], pts[i, 1], pts[i, 2]
+                for r in range(3):
+                    out[i, r] = m[r, 0] * x + m[r, 1] * y + m[r, 2] * z + m[r, 3]
+
+        return project, transform
+
+    def project(self, points, rot_x, rot_y, zoom, distance):
+        pts = np.ascontiguousarray(points, dtype=self.dtype).reshape(-1, 3)
+        out = np.empty_like(pts)
+        # Scalars in the working dtype, so float32 mode stays float32 inside the kernel
+        scalars = (*self.camera(rot_x, rot_y), zoom, distance, 0.1, WIDTH / 2, HEIGHT / 2)
+        self.kernels[0](pts, *(self.dtype.type(v) for v in scalars), out)
+        return out
+
+    def transform(self, points, matrix):
+        pts = np.ascontiguousarray(points, dtype=self.dtype).reshape(-1, 3)
+        out = np.empty_like(pts)
+        self.kernels[1](pts, np.ascontiguousarray(matrix, dtype=self.dtype), out)
+        return out
+
+COMPUTE_BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+def available_compute_backends():
+    """
+    Names of the backends installed in this environment
+
+    numba is only looked up, not imported, so selecting another backend
+    does not pay its import time. A numba that is installed but broken
+    shows up here and fails in make_compute_backend() instead.
+    """
+    names = ["python", "numpy"]
+    if importlib.util.find_spec("numba") is not None:
+        names.append("numba")
+    return names
+
+def make_compute_backend(name, float32=False):
+    if name not in available_compute_backends():
+        raise SystemExit(f"compute backend '{name}' is not available (is it installed?)")
+    try:
+        return COMPUTE_BACKENDS[name](np.float32 if float32 else np.float64)
+    except ImportError as e:
+        raise SystemExit(f"compute backend '{name}' is not available: {e}")
+
+def check_compute_backends(count=20000, seed=0):
+    """
+    Check every available backend (float64 and float32) against the
+    Python reference on random points, cameras and step matrices.
+
+    Returns: True if all agree within tolerance
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-6, 6, (count, 3))
+    cameras = [(350, -241, 250), (0, 90, 150), (90, 0, 350), (rng.uniform(0, 360), rng.uniform(-360, 0), 200)]
+    p1, p2 = tuple(rng.uniform(-3, 3, 3)), tuple(rng.uniform(-3, 3, 3))
+    ax = axis_transform(p1, p2)
+    matrices = [ax['T'], ax['Rz'] @ ax['T'], rotation_x_matrix(rng.uniform(0, 2 * PI)) @ ax['Ry'],
+                ax['T_inv'] @ ax['Rz_inv'] @ ax['Ry_inv']]
+
+    reference = PythonBackend()
+    ok = True
+    for name in available_compute_backends():
+        for float32 in (False, True):
+            try:
+                backend = COMPUTE_BACKENDS[name](np.float32 if float32 else np.float64)
+            except ImportError as e:
+                print(f"{name:7s} {'float32' if float32 else 'float64'}: skipped ({e})")
+                continue
+            # Screen coordinates are truncated to whole pixels, so rounding
+            # differences can move a point by one pixel in float32
+            pixel_tol, rtol = (1, 1e-5) if float32 else (1e-9, 1e-9)
+            worst_px = worst_depth = worst_xform = 0.0
+            for rot_x, rot_y, zoom in cameras:
+                expected = reference.project(points, rot_x, rot_y, zoom, camera_distance)
+                got = backend.project(points, rot_x, rot_y, zoom, camera_distance).astype(float)
+                worst_px = max(worst_px, np.abs(got[:, :2] - expected[:, :2]).max())
+                worst_depth = max(worst_depth, (np.abs(got[:, 2] - expected[:, 2]) / expected[:, 2]).max())
+            for matrix in matrices:
+                expected = reference.transform(points, matrix)
+                got = backend.transform(points, matrix).astype(float)
+                worst_xform = max(worst_xform, (np.abs(got - expected) / (1 + np.abs(expected))).max())
+
+            passed = worst_px <= pixel_tol and worst_depth <= rtol and worst_xform <= rtol
+            ok = ok and passed
+            print(f"{name:7s} {'float32' if float32 else 'float64'}: "
+                  f"{'ok  ' if passed else 'FAIL'} max pixel diff {worst_px:g}, "
+                  f"depth rel err {worst_depth:.2e}, transform rel err {worst_xform:.2e}")
+    return ok
+
+compute = make_compute_backend(args.compute, args.float32)
 
 def draw_line_3d(start, end, color, width=2):
     """Draw a line between two 3D points"""
-    p1 = project_3d(start)
-    p2 = project_3d(end)
-    pygame.draw.line(screen, color, (p1[0], p1[1]), (p2[0], p2[1]), width)
+    p1, p2 = project_points([start, end])
+    pygame.draw.line(screen, color, (int(p1[0]), int(p1[1])), (int(p2[0]), int(p2[1])), width)
+
+def draw_polyline_3d(points, color, width=2, closed=False):
+    """Draw consecutive line segments through 3D points, projected in one batch"""
+    projected = [(int(p[0]), int(p[1])) for p in project_points(points)]
+    if closed:
+        projected.append(projected[0])
+    for i in range(len(projected) - 1):
+        pygame.draw.line(screen, color, projected[i], projected[i + 1], width)
 
 # *** ADDED: New function for drawing arrows ***
 def draw_arrow_3d(start, end, color, width=3):
@@ -177,7 +500,7 @@ def draw_point_3d(point, color, size=6, label=""):
     pygame.draw.circle(screen, color, (p[0], p[1]), size)
     
     if label:
-        font = pygame.font.Font(None, 28)
+        font = get_font(28)
         text = font.render(label, True, color)
         screen.blit(text, (p[0] + 12, p[1] - 12))
     
@@ -191,13 +514,13 @@ def draw_plane_3d(corners, color, alpha=60):
     alpha: transparency (0=invisible, 255=opaque)
     """
     # Project all corners to 2D
-    projected = [project_3d(c) for c in corners]
+    projected = project_points(corners)
     
     # Create transparent surface
     plane_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     
     # Draw filled polygon
-    points_2d = [(p[0], p[1]) for p in projected]
+    points_2d = [(int(p[0]), int(p[1])) for p in projected]
     pygame.draw.polygon(plane_surface, (*color, alpha), points_2d)
     
     # Draw border
@@ -212,10 +535,11 @@ def draw_plane_3d(corners, color, alpha=60):
     avg_z = sum(p[2] for p in projected) / len(projected)
     return avg_z
 
-def draw_coordinate_planes():
+def coordinate_planes():
     """
-    Draw the three coordinate planes: XY, XZ, YZ
-    With transparency and proper depth sorting
+    The three coordinate planes: XY, XZ, YZ
+
+    Returns: list of (corners, color) sorted farthest first
     """
     plane_size = 6  # INCREASED from 4 to 6 for bigger planes
     planes = []
@@ -248,17 +572,23 @@ def draw_coordinate_planes():
     planes.append((yz_corners, (200, 220, 180)))
     
     # Calculate depth for each plane and sort (painter's algorithm)
+    # (all 12 corners projected in one batch)
+    depths = project_points([c for corners, _ in planes for c in corners])[:, 2].reshape(len(planes), 4)
     plane_depths = []
-    for corners, color in planes:
-        projected = [project_3d(c) for c in corners]
-        avg_z = sum(p[2] for p in projected) / len(projected)
-        plane_depths.append((avg_z, corners, color))
+    for (corners, color), corner_depths in zip(planes, depths):
+        plane_depths.append((float(corner_depths.mean()), corners, color))
     
     # Sort by depth (draw farthest first)
     plane_depths.sort(reverse=True)
     
-    # Draw planes in order
-    for _, corners, color in plane_depths:
+    return [(corners, color) for _, corners, color in plane_depths]
+
+def draw_coordinate_planes():
+    """
+    Draw the three coordinate planes: XY, XZ, YZ
+    With transparency and proper depth sorting
+    """
+    for corners, color in coordinate_planes():
         draw_plane_3d(corners, color, alpha=50)
 
 def draw_axes():
@@ -278,22 +608,14 @@ def draw_axes():
     draw_line_3d(origin, (0, 0, axis_length), BLUE, 4)     # Z-axis (OUTWARD)
     
     # Add labels at the end of each axis
-    font = pygame.font.Font(None, 36)
+    font = get_font(36)
+    label_at = axis_length + 0.5
+    labels = project_points([(label_at, 0, 0), (0, label_at, 0), (0, 0, label_at)])
     
-    # X label
-    p = project_3d((axis_length + 0.5, 0, 0))
-    text = font.render('X', True, RED)
-    screen.blit(text, (p[0], p[1]))
-    
-    # Y label
-    p = project_3d((0, (axis_length + 0.5), 0))
-    text = font.render('Y', True, GREEN)
-    screen.blit(text, (p[0], p[1]))
-    
-    # Z label
-    p = project_3d((0, 0, axis_length + 0.5))
-    text = font.render('Z', True, BLUE)
-    screen.blit(text, (p[0], p[1]))
+    # X, Y and Z labels
+    for p, name, color in zip(labels, 'XYZ', (RED, GREEN, BLUE)):
+        text = font.render(name, True, color)
+        screen.blit(text, (int(p[0]), int(p[1])))
 
 # ------------------------------------------------------------------------
 def draw_arc_3d(center, radius, start_angle, end_angle, normal, color, width=3, segments=20):
@@ -320,8 +642,7 @@ def draw_arc_3d(center, radius, start_angle, end_angle, normal, color, width=3,
         z = center[2] + radius * (math.cos(angle) * perp1[2] + math.sin(angle) * perp2[2])
         points.append((x, y, z))
     
-    for i in range(len(points) - 1):
-        draw_line_3d(points[i], points[i+1], color, width)
+    draw_polyline_3d(points, color, width)
 
 # ---------------------------------------------------------------------------
 
@@ -338,6 +659,10 @@ def apply_transformation(point, matrix):
     result = matrix @ p #Series of matirx multiplication
     return (result[0], result[1], result[2])
 
+def apply_to_points(matrix, *points):
+    """Apply one 4x4 matrix to several points in a single batched call"""
+    return [tuple(p) for p in transform_points(points, matrix)]
+
 def translation_matrix(tx, ty, tz):
     """Create translation matrix"""
     return np.array([
@@ -382,6 +707,44 @@ def rotation_x_matrix(angle):
 
 # ---------------------------------------------------------------------------
 
+# Axis transform cache:
+# alpha, beta and the step matrices only depend on P1 and P2, so they are
+# computed once and rebuilt only when the axis is moved (mouse drag).
+
+axis_cache = {'key': None, 'data': None}
+
+def axis_transform(p1, p2):
+    """Return angles and matrices for the axis P1 -> P2 (cached)"""
+    key = (tuple(p1), tuple(p2))
+    if axis_cache['key'] == key:
+        return axis_cache['data']
+
+    # Step 1: translate P1 to origin
+    tx, ty, tz = -p1[0], -p1[1], -p1[2]
+    T = translation_matrix(tx, ty, tz)
+
+    # Step 2: alpha from the translated axis direction
+    a, b, c = normalize_vector(apply_transformation(p2, T))
+    d = math.sqrt(a*a + b*b)
+    if d > 1e-10:
+        alpha = math.atan2(b / d, a / d)
+    else:
+        alpha = 0
+
+    # Step 3: beta
+    beta = math.atan2(-c, d)
+
+    data = {
+        'T': T, 'Rz': rotation_z_matrix(-alpha), 'Ry': rotation_y_matrix(-beta),
+        'T_inv': translation_matrix(p1[0], p1[1], p1[2]),
+        'Rz_inv': rotation_z_matrix(alpha), 'Ry_inv': rotation_y_matrix(beta),
+        't': (tx, ty, tz), 'alpha': alpha, 'beta': beta,
+        'd': d, 'a': a, 'b': b, 'c': c
+    }
+    axis_cache['key'] = key
+    axis_cache['data'] = data
+    return data
+
 # Transfromation Steps:
 
 def step_0_original(point, p1, p2):
@@ -390,57 +753,38 @@ def step_0_original(point, p1, p2):
 
 def step_1_translate(point, p1, p2):
     """Translate so that P1 is at origin"""
-    tx, ty, tz = -p1[0], -p1[1], -p1[2]
-    T = translation_matrix(tx, ty, tz)
-    new_point = apply_transformation(point, T)
-    new_p1 = apply_transformation(p1, T)
-    new_p2 = apply_transformation(p2, T)
-    return new_point, new_p1, new_p2, {'T': (tx, ty, tz)}
+    ax = axis_transform(p1, p2)
+    T = ax['T']
+    new_point, new_p1, new_p2 = apply_to_points(T, point, p1, p2)
+    return new_point, new_p1, new_p2, {'T': ax['t']}
 
 def step_2_rotate_z(point, p1, p2):
     """Rotate around Z-axis to align P2 with XZ plane"""
+    ax = axis_transform(p1, p2)
+
     #  First apply step 1
     point, p1, p2, _ = step_1_translate(point, p1, p2)
 
-    #Calculate alpha
-    a, b, c = normalize_vector(p2)
-    d = math.sqrt(a*a + b*b) #cause viewed from z axis in the XY plane
-
-    if d > 1e-10:
-        cos_alpha = a / d
-        sin_alpha = b / d
-        alpha = math.atan2(sin_alpha, cos_alpha)
-    else:
-        alpha = 0
-    
     #Apply Rz(-alpha)
-    Rz = rotation_z_matrix(-alpha)
-    new_point = apply_transformation(point, Rz)
-    new_p1 = apply_transformation(p1, Rz)
-    new_p2 = apply_transformation(p2, Rz)
+    Rz = ax['Rz']
+    new_point, new_p1, new_p2 = apply_to_points(Rz, point, p1, p2)
 
     return new_point, new_p1, new_p2, {
-        'alpha': alpha, 'd': d, 'a': a, 'b': b, 'c': c
+        'alpha': ax['alpha'], 'd': ax['d'], 'a': ax['a'], 'b': ax['b'], 'c': ax['c']
         }
 
 
 def step_3_rotate_y(point, p1, p2):
     """Step 3: Rotate about Y-axis to align with X-axis"""
+    ax = axis_transform(p1, p2)
+
     # Apply steps 1 and 2
     point, p1, p2, info = step_2_rotate_z(point, p1, p2)
-    alpha, d, a, b, c = info['alpha'], info['d'], info['a'], info['b'], info['c']
-    
-    # Calculate beta
-    cos_beta = d
-    sin_beta = -c
-    beta = math.atan2(sin_beta, cos_beta)
-    info['beta'] = beta
+    info['beta'] = ax['beta']
     
     # Apply Ry(-beta)
-    Ry = rotation_y_matrix(-beta)
-    new_point = apply_transformation(point, Ry)
-    new_p1 = apply_transformation(p1, Ry)
-    new_p2 = apply_transformation(p2, Ry)
+    Ry = ax['Ry']
+    new_point, new_p1, new_p2 = apply_to_points(Ry, point, p1, p2)
     
     return new_point, new_p1, new_p2, info
 
@@ -451,37 +795,30 @@ def step_4_rotate_x(point, p1, p2, theta):
 
     # Apply Rx(theta)
     Rx = rotation_x_matrix(theta)
-    new_point = apply_transformation(point, Rx)
-    new_p1 = apply_transformation(p1, Rx)
-    new_p2 = apply_transformation(p2, Rx)
+    new_point, new_p1, new_p2 = apply_to_points(Rx, point, p1, p2)
 
     return new_point, new_p1, new_p2, info
 
 def step_5_inverse(point, p1_orig, p2_orig, theta):
     """Step 5: Apply inverse transformations"""
+    ax = axis_transform(p1_orig, p2_orig)
+
     # Get to step 4
     point, p1, p2, info = step_4_rotate_x(point, p1_orig, p2_orig, theta)
-    alpha, beta = info['alpha'], info['beta']
     
     # Apply inverse: Ry(beta), Rz(alpha), Translate back
-    Ry_inv = rotation_y_matrix(beta)
-    Rz_inv = rotation_z_matrix(alpha)
-    T_inv = translation_matrix(p1_orig[0], p1_orig[1], p1_orig[2])
+    Ry_inv = ax['Ry_inv']
+    Rz_inv = ax['Rz_inv']
+    T_inv = ax['T_inv']
     
     # === INVERSE Y ===
-    new_point = apply_transformation(point, Ry_inv)
-    new_p1 = apply_transformation(p1, Ry_inv)
-    new_p2 = apply_transformation(p2, Ry_inv)
+    new_point, new_p1, new_p2 = apply_to_points(Ry_inv, point, p1, p2)
 
     # === INVERSE Z ===
-    new_point = apply_transformation(new_point, Rz_inv)
-    new_p1 = apply_transformation(new_p1, Rz_inv)
-    new_p2 = apply_transformation(new_p2, Rz_inv)
+    new_point, new_p1, new_p2 = apply_to_points(Rz_inv, new_point, new_p1, new_p2)
 
     # === INVERSE TRANSLATION ===
-    new_point = apply_transformation(new_point, T_inv)
-    new_p1 = apply_transformation(new_p1, T_inv)
-    new_p2 = apply_transformation(new_p2, T_inv)
+    new_point, new_p1, new_p2 = apply_to_points(T_inv, new_point, new_p1, new_p2)
 
     return new_point, new_p1, new_p2, info
 
@@ -518,10 +855,10 @@ def draw_arbitrary_axis(p1, p2):
     draw_point_3d(p1, ORANGE, 10, "P1")
     draw_point_3d(p2, ORANGE, 10, "P2")
 
-def draw_cube(center, size, color):
-    """Draw a cube at given center"""
+def cube_vertices(center, size):
+    """The 8 corners of an axis-aligned cube"""
     half = size / 2
-    vertices = [
+    return [
         (center[0]-half, center[1]-half, center[2]-half),
         (center[0]+half, center[1]-half, center[2]-half),
         (center[0]+half, center[1]+half, center[2]-half),
@@ -531,6 +868,10 @@ def draw_cube(center, size, color):
         (center[0]+half, center[1]+half, center[2]+half),
         (center[0]-half, center[1]+half, center[2]+half)
     ]
+
+def draw_cube(center, size, color):
+    """Draw a cube at given center"""
+    vertices = cube_vertices(center, size)
     
     edges = [
         (0,1), (1,2), (2,3), (3,0),
@@ -538,40 +879,17 @@ def draw_cube(center, size, color):
         (0,4), (1,5), (2,6), (3,7)
     ]
     
+    # Project the 8 corners once and reuse them for edges and points
+    projected = [(int(p[0]), int(p[1])) for p in project_points(vertices)]
+    
     for edge in edges:
-        draw_line_3d(vertices[edge[0]], vertices[edge[1]], color, 3)
+        pygame.draw.line(screen, color, projected[edge[0]], projected[edge[1]], 3)
     
-    for vertex in vertices:
-        draw_point_3d(vertex, color, 4)
-
-def draw_step_info():
-    """Draw information panel for current step"""
-    panel_x =10
-    panel_y = 10
-
-    font_title = pygame.font.Font(None, 32)
-    font = pygame.font.Font(None, 24)
-
-    #Title
-    title = font_title.render("Transformation Step Info", True, WHITE)
-    screen.blit(title, (panel_x, panel_y))
-    panel_y += 40
-
-    # Currwnt step
-    step_names = [
-        "Step 0 : Original - Initial Configuration",
-        "Step 1 : Translation - Move P1 to Origin",
-        "Step 2 : Rotate Z - Align P2 with XZ Plane (α)", 
-        "Step 3 : Rotate Y - Align P2 with X-axis (β)",
-        "Step 4 : Rotate X - Apply Rotation around X-axis (θ)",
-        "Step 5 : Inverse - Return to Original Position with inverse transmormation"
-    ]
-
-    step_text = font_title.render(step_names[current_step], True, LIGHT_BLUE)
-    screen.blit(step_text, (panel_x, panel_y))
-    panel_y += 40
+    for p in projected:
+        pygame.draw.circle(screen, color, p, 4)
 
-    #Step-specific info
+def step_info_lines():
+    """Text lines shown under the current step title"""
     if current_step == STEP_0_ORIGINAL:
         lines = [
             f"Rotation axis from P1 to P2",
@@ -632,29 +950,59 @@ def draw_step_info():
             "",
             "Final: Point rotated about arbitrary axis!"
         ]
+    return lines
+
+def draw_step_info(surface=None, lines=None):
+    """Draw information panel for current step"""
+    if surface is None:
+        surface = screen
+    if lines is None:
+        lines = step_info_lines()
+
+    panel_x =10
+    panel_y = 10
+
+    font_title = get_font(32)
+    font = get_font(24)
+
+    #Title
+    title = font_title.render("Transformation Step Info", True, WHITE)
+    surface.blit(title, (panel_x, panel_y))
+    panel_y += 40
+
+    # Currwnt step
+    step_names = [
+        "Step 0 : Original - Initial Configuration",
+        "Step 1 : Translation - Move P1 to Origin",
+        "Step 2 : Rotate Z - Align P2 with XZ Plane (α)", 
+        "Step 3 : Rotate Y - Align P2 with X-axis (β)",
+        "Step 4 : Rotate X - Apply Rotation around X-axis (θ)",
+        "Step 5 : Inverse - Return to Original Position with inverse transmormation"
+    ]
+
+    step_text = font_title.render(step_names[current_step], True, LIGHT_BLUE)
+    surface.blit(step_text, (panel_x, panel_y))
 
-    for line in lines:
+    for i, line in enumerate(lines):
         text = font.render(line, True, WHITE)
-        screen.blit(text, (panel_x, panel_y))
-        panel_y += 25
+        surface.blit(text, step_info_line_pos(i))
 
+def step_info_line_pos(i):
+    """Screen position of the i-th line under the step title"""
+    return (10, 90 + 25 * i)
 
-def draw_controls():
+# Step info lines that change every animated frame (index per step)
+STEP_INFO_LIVE_LINE = {STEP_4_ROTATE_X: 0}
+
+
+def draw_controls(surface=None):
     """Draw control panel"""
+    if surface is None:
+        surface = screen
     panel_x = 10
-    panel_y = HEIGHT - 270
-    
-    pygame.draw.rect(screen, (20, 20, 20), (panel_x - 5, panel_y - 5, 400, 245), border_radius=5)
-    pygame.draw.rect(screen, (80, 80, 80), (panel_x - 5, panel_y - 5, 400, 245), 2, border_radius=5)
-    
-    font_title = pygame.font.Font(None, 28)
-    font = pygame.font.Font(None, 24)
+    panel_y = HEIGHT - 330
     
-    title = font_title.render("Controls:", True, YELLOW)
-    screen.blit(title, (panel_x, panel_y))
-    panel_y += 35
-    
-    controls = [
+    controls = (
         "SPACE: Play/Pause rotation",
         "← →: Previous/Next step",
         "K/J: Pitch camera (up/down)",
@@ -663,13 +1011,823 @@ def draw_controls():
         "1/2/3/4: View YZ/XZ/XY/3D",
         "R: Reset camera",
         "A: Toggle angle display",
-        "V: Toggle position vector" 
-    ]
+        "V: Toggle position vector",
+        "T: Toggle motion trail",
+        "Mouse: Drag P1/P2/P (step 0)"
+    )
+    
+    panel = render_controls(controls, YELLOW, WHITE)
+    surface.blit(panel, (panel_x - 5, panel_y - 5))
+
+@functools.lru_cache(maxsize=None)
+def render_controls(controls, title_color, text_color):
+    """Rasterize the control panel with its top-left corner at (0, 0), once per content"""
+    panel = pygame.Surface((400, 320), pygame.SRCALPHA)
+    
+    pygame.draw.rect(panel, (20, 20, 20), (0, 0, 400, 320), border_radius=5)
+    pygame.draw.rect(panel, (80, 80, 80), (0, 0, 400, 320), 2, border_radius=5)
+    
+    font_title = get_font(28)
+    font = get_font(24)
+    
+    text_x, text_y = 5, 5
+    title = font_title.render("Controls:", True, title_color)
+    panel.blit(title, (text_x, text_y))
+    text_y += 35
     
     for control in controls:
-        text = font.render(control, True, WHITE)
-        screen.blit(text, (panel_x, panel_y))
-        panel_y += 25
+        text = font.render(control, True, text_color)
+        panel.blit(text, (text_x, text_y))
+        text_y += 25
+    # convert_alpha() needs a display surface, which the sdl2 backend lacks
+    if renderer is None:
+        panel = panel.convert_alpha()
+    return panel
+
+# ========================================
+# MOTION TRAIL
+# ========================================
+
+TRAIL_LENGTH = 150      # frames kept per vertex
+TRAIL_SUBSAMPLES = 4    # max dots drawn per segment between two frames
+TRAIL_MAX_ALPHA = 220
+
+class TrailBuffer:
+    """
+    Ring buffer of the last `length` positions of `vertices` tracked points
+
+    Alongside the world positions it keeps their projected screen
+    coordinates, so a frame only projects the newest sample unless the
+    camera moved. All storage, including the scratch arrays used by
+    draw_trail(), is allocated once; push() overwrites the oldest slot.
+    """
+
+    def __init__(self, length, vertices, dtype=np.float64):
+        self.positions = np.zeros((length, vertices, 3), dtype=dtype)
+        self.screen_xy = np.zeros((2, length, vertices), dtype=np.float32)  # x plane, y plane
+        self.head = 0   # slot written next
+        self.count = 0
+        self.pushes = 0      # samples pushed so far; drives the fade
+        self.key = None
+        self.camera = None   # camera the screen coordinates belong to
+        self.drawn = None    # self.pushes when trail_layer last showed this trail
+        self.area = None     # part of trail_layer that may hold visible dots
+
+        # Scratch for draw_trail(): segment k runs from slot k-1 to slot k
+        self.prev_xy = np.zeros_like(self.screen_xy)
+        self.delta_xy = np.zeros_like(self.screen_xy)
+        self.dots = np.zeros((2, length, TRAIL_SUBSAMPLES, vertices), dtype=np.float32)
+        self.dots_px = np.zeros(self.dots.shape, dtype=np.int32)
+        self.dots_index = np.zeros(self.dots.shape[1:], dtype=np.int32)
+        self.ages = np.zeros(length, dtype=np.int64)
+        self.alpha = np.zeros((length, 1, 1), dtype=np.uint32)
+        self.packed = np.zeros((length, 1, vertices), dtype=np.uint32)
+        self.bounds = np.zeros((length, 4), dtype=np.int32)  # per segment: x0, y0, x1, y1
+
+    def push(self, points):
+        self.positions[self.head] = points
+        if self.camera == current_camera():
+            self.screen_xy[:, self.head] = project_points(self.positions[self.head])[:, :2].T
+        self.head = (self.head + 1) % len(self.positions)
+        self.count = min(self.count + 1, len(self.positions))
+        self.pushes += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.drawn = None
+
+    def fade(self, pushes):
+        """Alpha a dot has lost by the time `pushes` samples were pushed"""
+        return pushes * TRAIL_MAX_ALPHA // (len(self.positions) - 1)
+
+    def update_projection(self):
+        """Re-project every stored sample if the camera changed"""
+        camera = current_camera()
+        if self.camera == camera:
+            return
+        length, vertices = self.positions.shape[:2]
+        projected = project_points(self.positions.reshape(-1, 3))
+        self.screen_xy[:] = projected[:, :2].T.reshape(2, length, vertices)
+        self.camera = camera
+        self.drawn = None   # every dot on the layer moved
+
+trail_layer = None
+
+def draw_trail(trail, colors):
+    """
+    Draw every tracked vertex's trail with alpha fading towards the oldest
+
+    trail_layer keeps the dots between frames. Each frame with one new
+    sample fades the whole trail by one step, with a saturating alpha
+    subtract over its area, and adds the newest segment on top. That
+    costs the trail's screen area plus one segment's dots, whatever its
+    length. Moving the camera, clearing the trail or missing a frame
+    redraws all length x vertices segments instead. So orbiting the
+    camera still costs about as much as a full redraw every frame, which
+    is tens of ms with thousands of vertices.
+    colors: (vertices, 3) RGB per tracked vertex
+    """
+    global trail_layer
+    if trail_layer is None:
+        trail_layer = pygame.Surface((WIDTH + 2, HEIGHT + 2), pygame.SRCALPHA)
+    trail.update_projection()
+
+    length = len(trail.positions)
+    n = trail.count
+    rgb = None
+    if n >= 2:
+        r_shift, g_shift, b_shift, _ = trail_layer.get_shifts()
+        rgb = np.asarray(colors, dtype=np.uint32)
+        rgb = (rgb[:, 0] << r_shift) | (rgb[:, 1] << g_shift) | (rgb[:, 2] << b_shift)
+
+    np.subtract(trail.head - 1, np.arange(length), out=trail.ages)
+    np.mod(trail.ages, length, out=trail.ages)
+    # Age of the sample each segment ends on; the oldest sample and empty
+    # slots have no incoming segment
+    valid = trail.ages < n - 1
+
+    if trail.drawn is None or trail.pushes - trail.drawn > 1:
+        redraw_trail(trail, valid, rgb)
+    elif trail.pushes != trail.drawn:
+        fade = trail.fade(trail.pushes) - trail.fade(trail.pushes - 1)
+        if trail.area is not None and fade:
+            trail_layer.fill((0, 0, 0, fade), trail.area, special_flags=pygame.BLEND_RGBA_SUB)
+        if n >= 2:
+            newest = (trail.head - 1) % length
+            segment = slice(newest, newest + 1)
+            prev = (newest - 1) % length
+            trail.prev_xy[:, segment] = trail.screen_xy[:, prev, None]
+            np.subtract(trail.screen_xy[:, segment], trail.prev_xy[:, segment], out=trail.delta_xy[:, segment])
+            trail.alpha[segment] = TRAIL_MAX_ALPHA
+            rasterize_trail(trail, segment, rgb, steps=TRAIL_SUBSAMPLES)
+    trail.drawn = trail.pushes
+
+    # Blit only the area the live segments touched
+    trail.area = None
+    if n >= 2:
+        bounds = trail.bounds[valid]
+        x0 = max(1, int(bounds[:, 0].min()))
+        y0 = max(1, int(bounds[:, 1].min()))
+        x1 = min(WIDTH, int(bounds[:, 2].max()))
+        y1 = min(HEIGHT, int(bounds[:, 3].max()))
+        if x1 >= x0 and y1 >= y0:
+            trail.area = pygame.Rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+            screen.blit(trail_layer, (x0 - 1, y0 - 1), trail.area)
+
+def redraw_trail(trail, valid, rgb):
+    """Clear the trail's old dots from trail_layer and rasterize every segment"""
+    if trail.area is not None:
+        trail_layer.fill((0, 0, 0, 0), trail.area)
+    if rgb is None:
+        return
+
+    xy, prev, delta = trail.screen_xy, trail.prev_xy, trail.delta_xy
+    invalid = ~valid
+    newest = (trail.head - 1) % len(trail.positions)
+    prev[:, 1:] = xy[:, :-1]
+    prev[:, 0] = xy[:, -1]
+    np.subtract(xy, prev, out=delta)
+    # Segments without a valid start collapse onto the newest sample; they
+    # stay out of the step count and are parked off-screen
+    delta[:, invalid] = 0
+    prev[:, invalid] = xy[:, newest, None]
+
+    # Same alpha each segment would have reached by fading frame by frame
+    alpha = TRAIL_MAX_ALPHA - (trail.fade(trail.pushes) - trail.fade(trail.pushes - trail.ages))
+    trail.alpha[:, 0, 0] = np.where(valid, np.maximum(alpha, 0), 0)
+    # Oldest slots first, so newer dots land on top as they do when the
+    # trail is drawn frame by frame
+    head = trail.head
+    rasterize_trail(trail, slice(head, None), rgb, invalid[head:])
+    rasterize_trail(trail, slice(None, head), rgb, invalid[:head])
+
+def rasterize_trail(trail, segments, rgb, parked=None, steps=None):
+    """
+    Write a slice of the trail's segments into trail_layer as dots
+
+    Expects prev_xy, delta_xy and alpha filled in for those segments and
+    records their bounds. The layer has a 1 px margin: off-screen dots
+    are clamped onto it and `parked` segments written to its corner, so
+    no per-dot masks are needed.
+    rgb: packed RGB per tracked vertex
+    steps: dots per segment; by default as many as the longest segment
+        needs to look solid
+    """
+    prev, delta = trail.prev_xy[:, segments], trail.delta_xy[:, segments]
+    if delta.shape[1] == 0:
+        return
+
+    if steps is None:
+        longest = max(float(delta.max()), -float(delta.min()))
+        steps = min(TRAIL_SUBSAMPLES, max(1, math.ceil(longest)))
+    dots, px = trail.dots[:, segments, :steps], trail.dots_px[:, segments, :steps]
+    for k in range(steps):
+        np.multiply(delta, k / steps, out=dots[:, :, k])
+        dots[:, :, k] += prev
+    dots += 1  # layer margin
+    np.clip(dots[0], 0, WIDTH + 1, out=dots[0])
+    np.clip(dots[1], 0, HEIGHT + 1, out=dots[1])
+    np.copyto(px, dots, casting='unsafe')
+
+    bounds = trail.bounds[segments]
+    bounds[:, 0] = px[0].min(axis=(1, 2))
+    bounds[:, 1] = px[1].min(axis=(1, 2))
+    bounds[:, 2] = px[0].max(axis=(1, 2))
+    bounds[:, 3] = px[1].max(axis=(1, 2))
+
+    # Packed pixel = per-segment alpha | per-vertex RGB
+    alpha, packed = trail.alpha[segments], trail.packed[segments]
+    np.left_shift(alpha, trail_layer.get_shifts()[3], out=alpha)
+    np.bitwise_or(alpha, rgb, out=packed)
+
+    index = trail.dots_index[segments, :steps]
+    np.multiply(px[1], trail_layer.get_pitch() // 4, out=index)
+    index += px[0]
+    if parked is not None:
+        index[parked] = 0
+
+    buffer = trail_layer.get_buffer()
+    pixels = np.frombuffer(buffer, dtype=np.uint32)
+    pixels[index] = packed
+    del pixels, buffer
+
+# ========================================
+# SDL2 TEXTURE BACKEND
+# ========================================
+
+BLENDMODE_BLEND = 1  # SDL_BLENDMODE_BLEND
+
+plane_texture_cache = {'key': None, 'layers': []}
+hud_texture_cache = {}   # slot -> (content key, texture, rect)
+scene_texture = None
+
+def make_texture(surface):
+    """Upload a surface as an alpha-blended texture"""
+    texture = Texture.from_surface(renderer, surface)
+    texture.blend_mode = BLENDMODE_BLEND
+    return texture
+
+def plane_textures():
+    """
+    Textures for the coordinate planes, farthest first
+
+    Each plane is rasterized into a surface the size of its on-screen
+    bounding box. The textures only depend on the camera, so they are
+    rebuilt when the camera moves and reused on every other frame.
+    """
+    key = (rotation_x, rotation_y, scale)
+    if plane_texture_cache['key'] == key:
+        return plane_texture_cache['layers']
+
+    layers = []
+    screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+    for corners, color in coordinate_planes():
+        points_2d = [(int(p[0]), int(p[1])) for p in project_points(corners)]
+        xs = [p[0] for p in points_2d]
+        ys = [p[1] for p in points_2d]
+        # +2 so the 2px border is not clipped
+        rect = pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 2, max(ys) - min(ys) + 2)
+        rect = rect.clip(screen_rect)
+        if rect.width == 0 or rect.height == 0:
+            continue
+
+        local = [(x - rect.x, y - rect.y) for x, y in points_2d]
+        layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.polygon(layer, (*color, 50), local)
+        for i in range(len(local)):
+            pygame.draw.line(layer, (*color, 150), local[i], local[(i + 1) % len(local)], 2)
+        layers.append((make_texture(layer), rect))
+
+    plane_texture_cache['key'] = key
+    plane_texture_cache['layers'] = layers
+    return layers
+
+def hud_texture(slot, key, draw):
+    """
+    Texture for a HUD panel, re-rendered only when its content key changes
+
+    draw(surface) paints the panel onto a transparent full-window surface;
+    only its bounding box is uploaded. One texture is kept per slot.
+    """
+    entry = hud_texture_cache.get(slot)
+    if entry is None or entry[0] != key:
+        layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        draw(layer)
+        rect = layer.get_bounding_rect()
+        entry = (key, make_texture(layer.subsurface(rect)), rect)
+        hud_texture_cache[slot] = entry
+    return entry[1], entry[2]
+
+def text_texture(slot, text, pos, size=24, color=WHITE):
+    """Small texture holding one line of text, re-rendered when the text changes"""
+    entry = hud_texture_cache.get(slot)
+    if entry is None or entry[0] != text:
+        surface = get_font(size).render(text, True, color)
+        entry = (text, make_texture(surface), pygame.Rect(pos, surface.get_size()))
+        hud_texture_cache[slot] = entry
+    return entry[1], entry[2]
+
+def present_sdl2(capture=False):
+    """
+    Compose planes, scene layer and HUD with the renderer and present
+
+    With capture=True the composed frame is read back first and returned.
+    """
+    global scene_texture
+
+    renderer.draw_color = (*BLACK, 255)
+    renderer.clear()
+
+    for texture, rect in plane_textures():
+        texture.draw(dstrect=rect)
+
+    # Lines, points and labels drawn this frame
+    if scene_texture is None:
+        scene_texture = Texture(renderer, (WIDTH, HEIGHT), streaming=True)
+        scene_texture.blend_mode = BLENDMODE_BLEND
+    scene_texture.update(screen)
+    scene_texture.draw()
+
+    # Static part of the step panel is uploaded once per step (and axis);
+    # a line that changes every frame, like theta, gets its own small texture
+    lines = step_info_lines()
+    static = list(lines)
+    live = STEP_INFO_LIVE_LINE.get(current_step)
+    if live is not None:
+        static[live] = ""
+    hud = [
+        hud_texture('step', (current_step, tuple(static)), lambda s: draw_step_info(s, static)),
+        hud_texture('controls', None, draw_controls),
+    ]
+    if live is not None:
+        hud.append(text_texture('step_live', lines[live], step_info_line_pos(live)))
+    for texture, rect in hud:
+        texture.draw(dstrect=rect)
+
+    # Read back before present(), the back buffer is undefined afterwards
+    frame = renderer.to_surface() if capture else None
+    renderer.present()
+    return frame
+
+# ========================================
+# MOUSE PICKING
+# ========================================
+
+PICK_RADIUS = 14  # pixels
+
+class ScreenGrid:
+    """
+    Uniform grid over projected screen positions for hit testing
+
+    Points are bucketed by cell and kept sorted by cell key, so a query
+    only looks at the few cells around the cursor instead of every point.
+    """
+
+    def __init__(self, screen_xy, cell_size=32):
+        xy = np.asarray(screen_xy, dtype=float).reshape(-1, 2)
+        self.xy = xy
+        self.cell_size = cell_size
+        self.rows = HEIGHT // cell_size + 1
+
+        # Points off screen can never be clicked
+        on_screen = np.nonzero((xy[:, 0] >= 0) & (xy[:, 0] < WIDTH) &
+                               (xy[:, 1] >= 0) & (xy[:, 1] < HEIGHT))[0]
+        cells = (xy[on_screen] // cell_size).astype(int)
+        keys = cells[:, 0] * self.rows + cells[:, 1]
+
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.index = on_screen[order]
+
+    def nearest(self, x, y, radius):
+        """Index of the closest point within radius of (x, y), or None"""
+        reach = int(math.ceil(radius / self.cell_size))
+        cx, cy = int(x // self.cell_size), int(y // self.cell_size)
+
+        candidates = []
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                if i < 0 or j < 0 or j >= self.rows:
+                    continue
+                key = i * self.rows + j
+                lo = np.searchsorted(self.keys, key, 'left')
+                hi = np.searchsorted(self.keys, key, 'right')
+                candidates.append(self.index[lo:hi])
+
+        if not candidates:
+            return None
+        candidates = np.concatenate(candidates)
+        if len(candidates) == 0:
+            return None
+
+        dist2 = ((self.xy[candidates] - (x, y)) ** 2).sum(axis=1)
+        best = np.argmin(dist2)
+        if dist2[best] > radius * radius:
+            return None
+        return int(candidates[best])
+
+pick_cache = {'key': None, 'grid': None, 'depths': None}
+
+def pick_grid(points, key):
+    """
+    Screen grid and depths for the pickable points
+
+    Built from one batched projection and reused until the camera or the
+    points change. key must change whenever the points do.
+    """
+    full_key = (current_camera(), key)
+    if pick_cache['key'] != full_key:
+        projected = project_points(points)
+        pick_cache['grid'] = ScreenGrid(projected[:, :2])
+        pick_cache['depths'] = projected[:, 2]
+        pick_cache['key'] = full_key
+    return pick_cache['grid'], pick_cache['depths']
+
+def pick_point(points, key, pos):
+    """
+    Find which of the 3D points is under the mouse
+
+    Returns (index, depth) or (None, None)
+    """
+    grid, depths = pick_grid(points, key)
+    idx = grid.nearest(pos[0], pos[1], PICK_RADIUS)
+    if idx is None:
+        return None, None
+    return idx, float(depths[idx])
+
+# ========================================
+# INPUT RECORD / REPLAY
+# ========================================
+
+# Keys that are polled every frame (camera orbit and zoom)
+HELD_KEYS = (pygame.K_k, pygame.K_j, pygame.K_h, pygame.K_l, pygame.K_q, pygame.K_e)
+
+# Event attributes worth saving (everything else is window/platform noise)
+EVENT_ATTRS = ("key", "mod", "pos", "rel", "button", "buttons")
+
+INPUT_FORMAT_VERSION = 1
+
+recorded_frames = []
+replay_frames = None
+
+
+class HeldKeys:
+    """Stands in for pygame.key.get_pressed() during replay"""
+
+    def __init__(self, held):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def encode_event(event):
+    """Turn a pygame event into a small JSON-friendly list"""
+    attrs = {}
+    for name in EVENT_ATTRS:
+        if name in event.dict:
+            value = event.dict[name]
+            attrs[name] = list(value) if isinstance(value, tuple) else value
+    return [event.type, attrs]
+
+
+def decode_event(data):
+    """Rebuild a pygame event from encode_event() output"""
+    event_type, attrs = data
+    attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+
+def load_input_session(path):
+    """
+    Load a recorded session
+
+    File layout: one JSON header line, then one line per frame:
+    [held_keys, events]
+    """
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != INPUT_FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported input recording version {header.get('version')}")
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_input_session(path, frames):
+    """Write recorded frames in the format read by load_input_session()"""
+    with open(path, "w") as f:
+        f.write(json.dumps({"version": INPUT_FORMAT_VERSION, "frames": len(frames)}) + "\n")
+        for held, events in frames:
+            f.write(json.dumps([held, events], separators=(",", ":")) + "\n")
+
+
+def read_input(frame):
+    """
+    Return (keys, events) for this frame
+
+    Live input comes from pygame, replayed input from the loaded session.
+    Returns None once a replay runs out of frames.
+    """
+    if replay_frames is not None:
+        if frame >= len(replay_frames):
+            return None
+        held, events = replay_frames[frame]
+        # Drain the real queue so the window stays responsive
+        pygame.event.pump()
+        return HeldKeys(held), [decode_event(e) for e in events]
+
+    keys = pygame.key.get_pressed()
+    events = pygame.event.get()
+    if frame_server is not None:
+        events += frame_server.poll_input()
+        if frame_server.remote_held:
+            keys = HeldKeys([k for k in HELD_KEYS if keys[k]] + list(frame_server.remote_held))
+    if args.record:
+        held = [k for k in HELD_KEYS if keys[k]]
+        recorded_frames.append((held, [encode_event(e) for e in events]))
+    return keys, events
+
+# ========================================
+# FRAME STREAMING SERVER
+# ========================================
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+VIEWER_PAGE = b"""<!doctype html>
+<title>3D Arbitrary Axis Rotation</title>
+<body style="margin:0;background:#000">
+<img id="view" src="/stream" tabindex="0" draggable="false">
+<script>
+const view = document.getElementById("view");
+function send(e) {
+  fetch("/input", {method: "POST", headers: {"Content-Type": "application/json"},
+                   body: JSON.stringify([e])});
+}
+function pos(e) { return [e.offsetX, e.offsetY]; }
+document.addEventListener("keydown", e => { if (!e.repeat) send({type: "keydown", key: e.key.toLowerCase()}); e.preventDefault(); });
+document.addEventListener("keyup", e => { send({type: "keyup", key: e.key.toLowerCase()}); });
+view.addEventListener("mousedown", e => send({type: "mousedown", pos: pos(e), button: e.button + 1}));
+view.addEventListener("mouseup", e => send({type: "mouseup", pos: pos(e), button: e.button + 1}));
+view.addEventListener("mousemove", e => { if (e.buttons) send({type: "mousemotion", pos: pos(e)}); });
+</script>
+"""
+
+# Browser key names that differ from pygame's
+BROWSER_KEYS = {" ": "space", "arrowleft": "left", "arrowright": "right",
+                "arrowup": "up", "arrowdown": "down"}
+
+REMOTE_EVENT_TYPES = {
+    "keydown": pygame.KEYDOWN, "keyup": pygame.KEYUP,
+    "mousedown": pygame.MOUSEBUTTONDOWN, "mouseup": pygame.MOUSEBUTTONUP,
+    "mousemotion": pygame.MOUSEMOTION,
+}
+
+MAX_INPUT_BODY = 64 * 1024  # bytes per POST /input
+
+def parse_remote_events(body):
+    """
+    Validate a POST /input body and turn it into (event_type, attrs) pairs
+
+    The body must be a JSON list of objects. Key events need a known key
+    name; mouse events need pos = [x, y] and (for button events) an int
+    button. Raises ValueError on anything else so the render thread only
+    ever sees well-formed events.
+    """
+    data = json.loads(body)
+    if not isinstance(data, list):
+        raise ValueError("expected a list of events")
+
+    events = []
+    for item in data:
+        if not isinstance(item, dict):
+            raise ValueError("event must be an object")
+        event_type = REMOTE_EVENT_TYPES.get(item.get("type"))
+        if event_type is None:
+            raise ValueError("unknown event type")
+
+        attrs = {}
+        if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+            key = item.get("key")
+            if not isinstance(key, str):
+                raise ValueError("key must be a string")
+            attrs["key"] = pygame.key.key_code(BROWSER_KEYS.get(key, key))
+            attrs["mod"] = 0
+        else:
+            pos = item.get("pos")
+            if (not isinstance(pos, list) or len(pos) != 2 or
+                    not all(isinstance(v, (int, float)) and not isinstance(v, bool)
+                            and math.isfinite(v) for v in pos)):
+                raise ValueError("pos must be two numbers")
+            attrs["pos"] = (int(pos[0]), int(pos[1]))
+            if event_type != pygame.MOUSEMOTION:
+                button = item.get("button")
+                if not isinstance(button, int) or isinstance(button, bool):
+                    raise ValueError("button must be an int")
+                attrs["button"] = button
+        events.append((event_type, attrs))
+    return events
+
+class FrameServer:
+    """
+    MJPEG frame server bound to localhost
+
+    The render loop hands over raw pixels with submit(); JPEG encoding runs
+    on a small thread pool. Only the newest encoded frame is kept, so a slow
+    client simply skips frames, and submit() drops frames while all encoders
+    are busy. Input posted by the viewer page is queued and picked up by the
+    render loop with poll_input().
+    """
+
+    def __init__(self, port, workers=2, namehint="frame.jpg"):
+        self.port = port
+        self.workers = workers
+        self.namehint = namehint
+        self.encoder = ThreadPoolExecutor(max_workers=workers)
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.new_frame = threading.Condition(self.lock)
+        self.frame = None
+        self.frame_id = 0     # bumped whenever self.frame is replaced
+        self.frame_seq = 0    # submit order of the frame in self.frame
+        self.next_seq = 0
+        self.clients = 0
+        self.dropped = 0
+        self.input = queue.Queue()
+        self.remote_held = set()
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.make_handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(VIEWER_PAGE)))
+                    self.end_headers()
+                    self.wfile.write(VIEWER_PAGE)
+                elif self.path == "/stream":
+                    server.stream(self)
+                else:
+                    self.send_error(404)
+
+            def same_origin(self):
+                """
+                Only accept requests addressed to a loopback name from its own page
+
+                Any port is allowed so the page also works through a
+                forwarded port (ssh -L); checking the hostname is enough to
+                refuse DNS-rebound requests.
+                """
+                host = self.headers.get("Host", "")
+                hostname = host.rpartition(":")[0] if ":" in host else host
+                if hostname not in ("127.0.0.1", "localhost"):
+                    return False
+                origin = self.headers.get("Origin")
+                return origin is None or origin == f"http://{host}"
+
+            def do_POST(self):
+                if self.path != "/input":
+                    self.send_error(404)
+                    return
+                # application/json is not a CORS "simple" type, so other
+                # pages cannot post here without a (refused) preflight
+                content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+                if content_type != "application/json" or not self.same_origin():
+                    self.send_error(403)
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    self.send_error(400)
+                    return
+                if length < 0 or length > MAX_INPUT_BODY:
+                    self.send_error(413)
+                    return
+                try:
+                    events = parse_remote_events(self.rfile.read(length))
+                except ValueError:  # includes JSON errors and unknown key names
+                    self.send_error(400)
+                    return
+                for event in events:
+                    server.input.put(event)
+                self.send_response(204)
+                self.end_headers()
+
+        return Handler
+
+    def stream(self, handler):
+        """Send multipart JPEG frames until the client disconnects"""
+        handler.send_response(200)
+        handler.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        handler.end_headers()
+
+        with self.lock:
+            self.clients += 1
+        last_sent = 0
+        try:
+            while True:
+                with self.new_frame:
+                    self.new_frame.wait_for(lambda: self.frame_id != last_sent)
+                    jpeg, last_sent = self.frame, self.frame_id
+                handler.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n")
+                handler.wfile.write(f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                handler.wfile.write(jpeg + b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.lock:
+                self.clients -= 1
+
+    def wants_frame(self):
+        """True if someone is watching and an encoder is free"""
+        with self.lock:
+            if self.clients == 0:
+                return False
+            if self.in_flight >= self.workers:
+                self.dropped += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def submit(self, surface):
+        """Queue a rendered frame for encoding (call only after wants_frame())"""
+        self.next_seq += 1
+        try:
+            pixels = pygame.image.tobytes(surface, "RGB")
+            self.encoder.submit(self.encode, self.next_seq, pixels, surface.get_size())
+        except Exception:
+            with self.lock:
+                self.in_flight -= 1
+            raise
+
+    def encode(self, seq, pixels, size):
+        jpeg = None
+        try:
+            frame = pygame.image.frombytes(pixels, size, "RGB")
+            buffer = io.BytesIO()
+            pygame.image.save(frame, buffer, self.namehint)
+            jpeg = buffer.getvalue()
+        finally:
+            with self.new_frame:
+                self.in_flight -= 1
+                # Two workers can finish out of order; never go back in time
+                if jpeg is not None and seq > self.frame_seq:
+                    self.frame = jpeg
+                    self.frame_seq = seq
+                    self.frame_id += 1
+                    self.new_frame.notify_all()
+
+    def poll_input(self):
+        """Drain remote input as pygame events (render thread only)"""
+        events = []
+        while True:
+            try:
+                event_type, attrs = self.input.get_nowait()
+            except queue.Empty:
+                break
+            # Already validated by parse_remote_events()
+            if event_type == pygame.KEYDOWN:
+                self.remote_held.add(attrs["key"])
+            elif event_type == pygame.KEYUP:
+                self.remote_held.discard(attrs["key"])
+            events.append(pygame.event.Event(event_type, attrs))
+        return events
+
+    def close(self):
+        self.httpd.shutdown()
+        self.encoder.shutdown(wait=False)
+
+frame_server = None
+
+# ========================================
+# FRAME TIMING
+# ========================================
+
+frame_times = []
+
+
+def timing_report(times):
+    """Summarise per-frame render times (seconds) in milliseconds"""
+    if not times:
+        return {"frames": 0}
+    ms = sorted(t * 1000 for t in times)
+    return {
+        "frames": len(ms),
+        "total_s": sum(times),
+        "mean_ms": sum(ms) / len(ms),
+        "p50_ms": ms[len(ms) // 2],
+        "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "max_ms": ms[-1],
+    }
 
 # ========================================
 # MAIN LOOP
@@ -682,11 +1840,38 @@ P2 = (-3, 2, 2.5)
 # Test point to rotate
 test_point = (-2.5, 1.5, 0.5)
 
+if args.check_backends:
+    pygame.quit()
+    raise SystemExit(0 if check_compute_backends() else 1)
+
+# Test point and its cube corners, traced during steps 4 and 5
+trail = TrailBuffer(TRAIL_LENGTH, 9, compute.dtype)
+trail_colors = [MAGENTA] + [CYAN] * 8
+
+# Points that can be dragged with the mouse (step 0 only)
+drag_target = None  # index into [P1, P2, test_point]
+drag_depth = 0
+
+if args.replay:
+    replay_frames = load_input_session(args.replay)
+
+if args.serve:
+    frame_server = FrameServer(args.serve)
+    print(f"Streaming on http://127.0.0.1:{args.serve}/")
+
+mark_startup("scene_setup")
+
+frame = 0
 running = True
 while running:
-   
+    frame_start = time.perf_counter()
+
     # Event handling
-    keys = pygame.key.get_pressed()
+    frame_input = read_input(frame)
+    if frame_input is None:
+        break  # End of replayed session
+    keys, events = frame_input
+    frame += 1
     
     # Camera controls (only in 3D view)
     if current_view == VIEW_3D:
@@ -705,7 +1890,7 @@ while running:
     if keys[pygame.K_e]:
         scale = max(150, scale - 3)
     
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
         elif event.type == pygame.KEYDOWN:
@@ -735,7 +1920,28 @@ while running:
                 show_angles = not show_angles
             elif event.key == pygame.K_v:
                 show_vector = not show_vector
-
+            elif event.key == pygame.K_t:
+                show_trail = not show_trail
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if current_step == STEP_0_ORIGINAL:
+                pickable = (P1, P2, test_point)
+                drag_target, drag_depth = pick_point(pickable, pickable, event.pos)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            drag_target = None
+        elif event.type == pygame.MOUSEMOTION and drag_target is not None and current_step == STEP_0_ORIGINAL:
+            # Move the point parallel to the screen at its original depth.
+            # Changing P1/P2 invalidates the axis cache for the next frame.
+            new_pos = unproject_point(event.pos[0], event.pos[1], drag_depth)
+            if drag_target == 0:
+                P1 = new_pos
+            elif drag_target == 1:
+                P2 = new_pos
+            else:
+                test_point = new_pos
+
+    # Dragging only edits the original scene; leaving step 0 ends it
+    if current_step != STEP_0_ORIGINAL:
+        drag_target = None
     
     # Update animation
 # *** FIXED: Changed comparison from function to constant ***
@@ -745,10 +1951,13 @@ while running:
             theta = 0
 
     # Clear screen
-    screen.fill(BLACK)
+    if renderer is None:
+        screen.fill(BLACK)
+        draw_coordinate_planes()
+    else:
+        screen.fill((0, 0, 0, 0))  # Planes are composed as textures
     
     # Draw scene
-    draw_coordinate_planes()
     draw_axes()
 
     axis_color = YELLOW
@@ -771,6 +1980,12 @@ while running:
 
     # Draw rotation axis
     draw_arbitrary_axis(display_p1, display_p2)
+
+    # Keep the pick grid current while the points are on screen, so a
+    # click only queries it
+    if current_step == STEP_0_ORIGINAL:
+        pickable = (P1, P2, test_point)
+        pick_grid(pickable, pickable)
     
     # Draw angle arcs
     if show_angles and info:
@@ -785,16 +2000,56 @@ while running:
         # elif current_step >= STEP_4_ROTATE_X and theta > 0:
         #     draw_arc_3d((0, 0, 0), 1.8, 0, theta, (1, 0, 0), MAGENTA, 3, 20)
 
+    # Motion trail: restart whenever the traced path itself changes
+    trail_key = (current_step, P1, P2, test_point)
+    if trail.key != trail_key:
+        trail.clear()
+        trail.key = trail_key
+    if current_step >= STEP_4_ROTATE_X and not paused:
+        trail.push([display_point] + cube_vertices(display_point, 0.4))
+    if show_trail and current_step >= STEP_4_ROTATE_X:
+        draw_trail(trail, trail_colors)
+
     # Draw cube at point
     draw_cube(display_point, 0.4, CYAN)
     draw_point_3d(display_point, MAGENTA, 8, "P")
 
-    # Draw UI
-    draw_step_info()
-    draw_controls()
-    
-    # Update display
-    pygame.display.flip()
-    clock.tick(60)
+    # Draw UI and update display
+    capture = frame_server is not None and frame_server.wants_frame()
+    if renderer is None:
+        draw_step_info()
+        draw_controls()
+        pygame.display.flip()
+        rendered = screen
+    else:
+        rendered = present_sdl2(capture)
+
+    if capture:
+        frame_server.submit(rendered)
+
+    if frame == 1:
+        mark_startup("first_frame")
+        if args.startup_report:
+            for phase, seconds in startup_phases:
+                print(f"{phase:12s} {seconds * 1000:8.1f} ms")
+            print(f"{'total':12s} {(time.perf_counter() - STARTUP_T0) * 1000:8.1f} ms")
+    frame_times.append(time.perf_counter() - frame_start)
+
+    # Replays run uncapped so timings compare raw frame cost
+    if replay_frames is None:
+        clock.tick(60)
+
+if frame_server is not None:
+    frame_server.close()
+
+if args.record:
+    save_input_session(args.record, recorded_frames)
+
+if args.timing:
+    with open(args.timing, "w") as f:
+        report = {"backend": args.backend, "compute": compute.name, "float32": args.float32,
+                  **timing_report(frame_times)}
+        report["startup_ms"] = {phase: seconds * 1000 for phase, seconds in startup_phases}
+        json.dump(report, f, indent=2)
 
-pygame.quit()
\ No newline at end of file
+pygame.quit()